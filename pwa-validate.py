@@ -1,15 +1,53 @@
 # PWA Best Practices Checker
+from __future__ import annotations
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 import json
-from urllib.parse import urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import argparse
+import atexit
+import codecs
+import queue
+import random
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
 import time
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Callable, Iterator, Optional
 from dataclasses import dataclass
 from enum import Enum
 import sys
 
+# Selenium is imported when the first browser is started; annotations only need the name
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# orjson is an optional, faster drop-in for parsing manifests and serializing suggested ones
+try:
+    import orjson
+
+    loads_json = orjson.loads
+
+    def dumps_json(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    loads_json = json.loads
+
+    def dumps_json(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# requests-cache is optional; with --cache, responses are kept on disk between runs
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
 # ANSI color codes
 class Colors:
     HEADER = '\033[95m'
@@ -20,6 +58,15 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# (connect, read) seconds to wait on any single outbound HTTP request
+REQUEST_TIMEOUT = (3, 10)
+
+# urlparse is pure Python; the same few URLs are parsed by most checks
+parse_url = lru_cache(maxsize=64)(urlparse)
+
+# Redirect targets containing any of these are treated as SSO providers
+SSO_RE = re.compile(r'saml|oauth|oidc', re.IGNORECASE)
+
 class Priority(Enum):
     CRITICAL = 1
     HIGH = 2
@@ -28,25 +75,388 @@ class Priority(Enum):
 
 @dataclass
 class Suggestion:
+    # Declared by hand rather than dataclass(slots=True) to keep Python < 3.10 working
+    __slots__ = ('title', 'description', 'priority', 'implementation_factory')
+
     title: str
     description: str
     priority: Priority
-    implementation: str
+    # Builds the implementation guide on demand; most guides are never printed
+    implementation_factory: Callable[[], str]
 
-def print_colored(text: str, color: str, bold: bool = False, end: str = '\n') -> None:
-    if bold:
-        print(f"{Colors.BOLD}{color}{text}{Colors.ENDC}", end=end)
+    @property
+    def implementation(self) -> str:
+        return self.implementation_factory()
+
+@dataclass
+class PageSnapshot:
+    """Head metadata of a page, parsed from its HTML."""
+    url: str
+    title: str
+    meta_tags: List[Dict[str, str]]
+    links: List[Dict[str, str]]
+    has_body_content: bool
+
+    def meta_content(self, name: str) -> Optional[str]:
+        for meta in self.meta_tags:
+            if meta['name'] == name:
+                return meta['content']
+        return None
+
+    def link_href(self, rel: str) -> Optional[str]:
+        for link in self.links:
+            if link.get('rel', '').lower() == rel and link.get('href'):
+                return urljoin(self.url, link['href'])
+        return None
+
+    def manifest_href(self) -> Optional[str]:
+        manifest_url = self.link_href('manifest')
+        if not manifest_url:
+            # Fall back to any link with manifest in the href
+            for link in self.links:
+                if 'manifest' in link.get('href', ''):
+                    return urljoin(self.url, link['href'])
+        return manifest_url
+
+class _PageParser(HTMLParser):
+    # Elements whose text is not visible page content
+    _HIDDEN = {'head', 'title', 'script', 'style', 'noscript', 'template'}
+    _MEDIA = {'img', 'svg', 'video', 'canvas', 'iframe', 'picture'}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.meta_tags: List[Dict[str, str]] = []
+        self.links: List[Dict[str, str]] = []
+        self.has_body_content = False
+        self._hidden_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]) -> None:
+        attributes = {name: value or '' for name, value in attrs}
+        if tag == 'meta':
+            self.meta_tags.append({'name': attributes.get('name', ''), 'content': attributes.get('content', '')})
+        elif tag == 'link':
+            self.links.append(attributes)
+        elif tag in self._MEDIA and not self._hidden_depth:
+            self.has_body_content = True
+        if tag in self._HIDDEN:
+            self._hidden_depth += 1
+            self._in_title = self._in_title or tag == 'title'
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._HIDDEN and self._hidden_depth:
+            self._hidden_depth -= 1
+            if tag == 'title':
+                self._in_title = False
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._hidden_depth and data.strip():
+            self.has_body_content = True
+
+def parse_page(html: str, url: str) -> PageSnapshot:
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    return PageSnapshot(
+        url=url,
+        title=parser.title.strip(),
+        meta_tags=parser.meta_tags,
+        links=parser.links,
+        has_body_content=parser.has_body_content
+    )
+
+def fetch_page(session: requests.Session, url: str) -> PageSnapshot:
+    """Fetch and parse the HTML as served, before any JavaScript runs."""
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        response.encoding = 'utf-8'
+    return parse_page(response.text, response.url)
+
+# Seconds to wait for a client-rendered page to finish loading and render its body
+RENDER_WAIT_TIMEOUT = 5
+
+# True once the load event has fired and the body has visible content
+PAGE_RENDERED_SCRIPT = """
+    const body = document.body;
+    return document.readyState === 'complete' && !!body &&
+        (body.innerText.trim().length > 0 ||
+         !!body.querySelector('img, svg, video, canvas, iframe, picture'));
+"""
+
+def load_page(pending: Future, driver: webdriver.Chrome) -> PageSnapshot:
+    """Use the served HTML, falling back to the rendered DOM for client-rendered pages."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        page = pending.result()
+        # An empty <body> means the content is rendered by JavaScript
+        if page.has_body_content:
+            return page
+    except requests.RequestException:
+        pass
+    # driver.get returns at DOMContentLoaded, before frameworks have rendered the body
+    # or injected their meta tags; snapshot whatever exists once the wait runs out
+    try:
+        WebDriverWait(driver, RENDER_WAIT_TIMEOUT, poll_frequency=0.1).until(
+            lambda d: d.execute_script(PAGE_RENDERED_SCRIPT)
+        )
+    except TimeoutException:
+        pass
+    return parse_page(driver.page_source, driver.current_url)
+
+def prefetch_manifest(session: requests.Session, pending: Future) -> Optional[str]:
+    """Find the manifest linked from the served HTML and fetch it into the response cache."""
+    manifest_url = pending.result().manifest_href()
+    if manifest_url:
+        try:
+            fetch_manifest(session, manifest_url)
+        except (requests.RequestException, ValueError):
+            # Failures are not cached; validate_manifest retries and reports them
+            pass
+    return manifest_url
+
+# Subresources the headless browser never needs to fetch. Patterns match the whole URL,
+# so each extension is anchored to the end of the path, with or without a query string
+BLOCKED_RESOURCE_PATTERNS = [
+    pattern
+    for extension in ('woff', 'woff2', 'ttf', 'otf', 'eot', 'mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a')
+    for pattern in (f'*.{extension}', f'*.{extension}?*')
+]
+
+class DriverPool:
+    """Keeps headless Chrome sessions warm so repeated scans skip browser startup."""
+
+    def __init__(self, size: int = 1) -> None:
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+
+    @staticmethod
+    def _create_driver() -> webdriver.Chrome:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        # Images are never inspected, so don't download them
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        # driver.get returns at DOMContentLoaded; the checks only need the DOM and runtime APIs
+        chrome_options.page_load_strategy = 'eager'
+        driver = webdriver.Chrome(options=chrome_options)
+        # Fonts and media are blocked at the network layer; scripts and stylesheets still load
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+        return driver
+
+    @contextmanager
+    def acquire(self) -> Iterator[webdriver.Chrome]:
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = self._create_driver()
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def _release(self, driver: webdriver.Chrome) -> None:
+        from selenium.common.exceptions import WebDriverException
+
+        # Reset the session instead of quitting it; drop it if the browser is unusable or the pool is full
+        try:
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            self._idle.put_nowait(driver)
+        except (WebDriverException, queue.Full):
+            driver.quit()
+
+    def close(self) -> None:
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            driver.quit()
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.close)
+
+class BoundedRetry(Retry):
+    """Retry that never waits longer than a request timeout between attempts."""
+
+    # Upper bound on the wait a Retry-After header can ask for
+    MAX_RETRY_AFTER = REQUEST_TIMEOUT[0]
+    # Random extra backoff so parallel checks don't retry in lockstep
+    BACKOFF_JITTER = 0.2
+
+    def increment(self, method: Optional[str] = None, url: Optional[str] = None, response: Any = None,
+                  error: Optional[Exception] = None, _pool: Any = None, _stacktrace: Any = None) -> Retry:
+        # A read timeout has already cost the full read timeout; retrying it would multiply the stall.
+        # Connections reset mid-response are still retried
+        if isinstance(error, ReadTimeoutError):
+            raise error.with_traceback(_stacktrace)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), self.MAX_RETRY_AFTER)
+
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() + random.uniform(0, self.BACKOFF_JITTER)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies REQUEST_TIMEOUT to requests sent without a timeout."""
+
+    def send(self, request: requests.PreparedRequest, timeout: Any = None, **kwargs: Any) -> requests.Response:
+        if timeout is None:
+            timeout = REQUEST_TIMEOUT
+        return super().send(request, timeout=timeout, **kwargs)
+
+# On-disk response cache used with --cache, so repeated runs against the same site are served locally
+PERSISTENT_CACHE_NAME = '.pwa_validate_cache'
+PERSISTENT_CACHE_TTL = 300
+
+# A caching session reads the whole body of a response to store it, which defeats
+# streamed requests that stop early; no-store makes it pass them straight through
+UNCACHED_HEADERS = {'Cache-Control': 'no-store'}
+
+# URLs answered from the on-disk cache during the current scan, mapped to whether the entry had expired
+_cache_hits: Dict[str, bool] = {}
+
+def record_cache_hit(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    if getattr(response, 'from_cache', False):
+        _cache_hits[response.url] = getattr(response, 'is_expired', False)
+
+def create_session(use_cache: bool = False) -> requests.Session:
+    """Create a session whose keep-alive pool is shared by every check against the target."""
+    # requests already advertises every content encoding it can decode (gzip, deflate, br when available)
+    if use_cache:
+        # Cache-Control from the server takes precedence over the default expiry
+        session = CachedSession(
+            PERSISTENT_CACHE_NAME,
+            backend='sqlite',
+            expire_after=PERSISTENT_CACHE_TTL,
+            cache_control=True,
+            allowable_methods=('GET', 'HEAD'),
+            stale_if_error=True,
+        )
+        session.hooks['response'].append(record_cache_hit)
     else:
-        print(f"{color}{text}{Colors.ENDC}", end=end)
+        session = requests.Session()
+    session.headers['Connection'] = 'keep-alive'
+    # Worker threads and the SSO walk share this pool; connection failures and gateway errors are retried
+    retry = BoundedRetry(
+        total=2,
+        status_forcelist=[502, 503, 504],
+        backoff_factor=0.3,
+        respect_retry_after_header=True,
+        # Hand back the last response instead of raising, so checks can report its status
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Reused across scans so batch runs against one origin pay the TCP/TLS handshake once
+http_session = create_session()
+atexit.register(http_session.close)
+
+# Runs the blocking HTTP fetches and page navigation of a scan concurrently with each other
+http_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='pwa-http')
+
+# Fetch results reused by later scans in the same run
+RESPONSE_CACHE_TTL = 300
+RESPONSE_CACHE_SIZE = 256
+_response_cache: Dict[tuple, tuple] = {}
+_response_cache_lock = threading.Lock()
+
+# Larger manifest bodies are rejected rather than downloaded in full
+MAX_MANIFEST_BYTES = 256 * 1024
+
+def cached_fetch(key: tuple, fetch: Callable[[], Any]) -> Any:
+    """Return a recent result stored under key, or call fetch and store what it returns."""
+    now = time.monotonic()
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+    if cached and now - cached[0] < RESPONSE_CACHE_TTL:
+        return cached[1]
+
+    result = fetch()
+    with _response_cache_lock:
+        _response_cache.pop(key, None)
+        if len(_response_cache) >= RESPONSE_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del _response_cache[next(iter(_response_cache))]
+        _response_cache[key] = (now, result)
+    return result
+
+def cached_request(session: requests.Session, method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Send a request, reusing a recent response to the same request instead of refetching it."""
+    key = (method, url, tuple(sorted(kwargs.items())))
+    return cached_fetch(key, lambda: session.request(method, url, **kwargs))
+
+def download_manifest(session: requests.Session, manifest_url: str) -> tuple[int, bytes]:
+    """Return the status code and body of a manifest, reading the body only for a 200 response."""
+    with session.get(manifest_url, headers=UNCACHED_HEADERS, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        if response.status_code != 200:
+            return response.status_code, b''
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=8192):
+            body += chunk
+            if len(body) > MAX_MANIFEST_BYTES:
+                raise ValueError(f"manifest is larger than {MAX_MANIFEST_BYTES // 1024} KB")
+        return response.status_code, bytes(body)
+
+def fetch_manifest(session: requests.Session, manifest_url: str) -> tuple[int, bytes]:
+    return cached_fetch(('manifest', manifest_url), lambda: download_manifest(session, manifest_url))
+
+# Escape codes are only written to a terminal; piped or redirected output stays plain
+IS_TTY = sys.stdout.isatty()
+
+# Escape prefix for every (color, bold) combination used in reports
+_COLOR_PREFIXES = {
+    (color, bold): (Colors.BOLD if bold else '') + color
+    for color in (Colors.HEADER, Colors.BLUE, Colors.GREEN, Colors.YELLOW, Colors.RED)
+    for bold in (False, True)
+}
+
+def print_colored(text: str, color: str, bold: bool = False, end: str = '\n') -> None:
+    if not IS_TTY:
+        sys.stdout.write(text + end)
+        return
+    prefix = _COLOR_PREFIXES.get((color, bold))
+    if prefix is None:
+        prefix = (Colors.BOLD if bold else '') + color
+    sys.stdout.write(prefix + text + Colors.ENDC + end)
+
+# Minimum seconds between progress line flushes; slow consoles pay heavily for each flush
+PROGRESS_FLUSH_INTERVAL = 0.05
+_last_progress_flush = 0.0
 
 def print_progress(step: str, total_steps: int, current_step: int) -> None:
+    global _last_progress_flush
     percentage = (current_step / total_steps) * 100
-    print_colored(f"\r[{step}] Progress: {percentage:.1f}%", Colors.BLUE, end='\r')
-    sys.stdout.flush()
+    if IS_TTY:
+        sys.stdout.write(f"{Colors.BLUE}\r[{step}] Progress: {percentage:.1f}%{Colors.ENDC}\r")
+    else:
+        sys.stdout.write(f"\r[{step}] Progress: {percentage:.1f}%\r")
+    now = time.monotonic()
+    if now - _last_progress_flush >= PROGRESS_FLUSH_INTERVAL:
+        sys.stdout.flush()
+        _last_progress_flush = now
+
+# Rule printed above and below the report header and final score
+HR = "=" * 50
 
-def check_redirects(url: str) -> None:
+def check_redirects(url: str, pending: Future) -> None:
     try:
-        response = requests.get(url, allow_redirects=False)
+        response = pending.result()
         if response.status_code in [301, 302]:
             print_colored(f"[PASS] Redirect detected for {url} -> {response.headers['Location']}", Colors.GREEN)
         else:
@@ -54,20 +464,38 @@ def check_redirects(url: str) -> None:
     except requests.RequestException as e:
         print_colored(f"[ERROR] Failed to check redirects for {url}: {e}", Colors.RED)
 
-def check_meta_tags(driver: webdriver.Chrome) -> None:
-    meta_tags = driver.execute_script(
-        "return Array.from(document.getElementsByTagName('meta')).map(tag => ({name: tag.name, content: tag.content}));")
+def check_meta_tags(page: PageSnapshot) -> None:
+    present = {meta['name'] for meta in page.meta_tags if meta['name']}
     required_meta = ["viewport", "description"]
     for tag in required_meta:
-        if any(meta['name'] == tag for meta in meta_tags):
+        if tag in present:
             print_colored(f"[PASS] Meta tag '{tag}' detected", Colors.GREEN)
         else:
             print_colored(f"[ERROR] Meta tag '{tag}' not found", Colors.RED)
 
-def check_robots_txt(url: str) -> None:
-    robots_url = f"{url.rstrip('/')}/robots.txt"
+def robots_txt_url(url: str) -> str:
+    return f"{url.rstrip('/')}/robots.txt"
+
+def get_without_body(session: requests.Session, url: str, allow_redirects: bool) -> requests.Response:
+    """Stand-in for HEAD on servers that reject it: open a GET and close it before the body is read."""
+    response = session.get(
+        url, headers=UNCACHED_HEADERS, allow_redirects=allow_redirects, stream=True, timeout=REQUEST_TIMEOUT
+    )
+    response.close()
+    return response
+
+def fetch_robots_txt(session: requests.Session, url: str) -> requests.Response:
+    """Request robots.txt without downloading its body; only the status is checked."""
+    robots_url = robots_txt_url(url)
+    response = cached_request(session, 'HEAD', robots_url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    if response.status_code in [405, 501]:
+        response = get_without_body(session, robots_url, allow_redirects=True)
+    return response
+
+def check_robots_txt(url: str, pending: Future) -> None:
+    robots_url = robots_txt_url(url)
     try:
-        response = requests.get(robots_url)
+        response = pending.result()
         if response.status_code == 200:
             print_colored(f"[PASS] robots.txt found at {robots_url}", Colors.GREEN)
         else:
@@ -75,25 +503,13 @@ def check_robots_txt(url: str) -> None:
     except requests.RequestException as e:
         print_colored(f"[ERROR] Failed to access {robots_url}: {e}", Colors.RED)
 
-def check_security_headers(url: str) -> tuple[int, list[Suggestion]]:
-    target_domain = urlparse(url).netloc
-    app_path = urlparse(url).path.rstrip('/')
-    current_domain = urlparse(url).netloc
-    
-    # Skip security checks if we're not on the target domain
-    if current_domain != target_domain:
-        return 0, []
-        
-    security_suggestions = []
-    security_score = 0
-    try:
-        response = requests.head(url)
-        headers = {
-            'Content-Security-Policy': {
-                'weight': 20,
-                'name': 'CSP',
-                'description': 'Prevents XSS attacks by controlling resource loading',
-                'example': f"""Add to your web server configuration:
+# Checked response headers; each 'example' is formatted with the app path only when the header is missing
+SECURITY_HEADERS = {
+    'Content-Security-Policy': {
+        'weight': 20,
+        'name': 'CSP',
+        'description': 'Prevents XSS attacks by controlling resource loading',
+        'example': """Add to your web server configuration:
 
                     Apache:
                     ```apache
@@ -116,12 +532,12 @@ def check_security_headers(url: str) -> tuple[int, list[Suggestion]]:
                         img-src 'self' data:";
                     }}
                     ```"""
-            },
-            'X-Content-Type-Options': {
-                'weight': 10,
-                'name': 'No Sniffing',
-                'description': 'Prevents MIME type sniffing',
-                'example': f"""Add to your web server configuration:
+    },
+    'X-Content-Type-Options': {
+        'weight': 10,
+        'name': 'No Sniffing',
+        'description': 'Prevents MIME type sniffing',
+        'example': """Add to your web server configuration:
                     
                     Apache:
                     ```apache
@@ -136,12 +552,12 @@ def check_security_headers(url: str) -> tuple[int, list[Suggestion]]:
                         add_header X-Content-Type-Options "nosniff";
                     }}
                     ```"""
-            },
-            'X-Frame-Options': {
-                'weight': 10,
-                'name': 'Frame Options',
-                'description': 'Prevents clickjacking attacks',
-                'example': f"""Add to your web server configuration:
+    },
+    'X-Frame-Options': {
+        'weight': 10,
+        'name': 'Frame Options',
+        'description': 'Prevents clickjacking attacks',
+        'example': """Add to your web server configuration:
                     
                     Apache:
                     ```apache
@@ -156,12 +572,12 @@ def check_security_headers(url: str) -> tuple[int, list[Suggestion]]:
                         add_header X-Frame-Options "SAMEORIGIN";
                     }}
                     ```"""
-            },
-            'X-XSS-Protection': {
-                'weight': 10,
-                'name': 'XSS Protection',
-                'description': 'Enables browser XSS filtering',
-                'example': f"""Add to your web server configuration:
+    },
+    'X-XSS-Protection': {
+        'weight': 10,
+        'name': 'XSS Protection',
+        'description': 'Enables browser XSS filtering',
+        'example': """Add to your web server configuration:
                     
                     Apache:
                     ```apache
@@ -176,22 +592,34 @@ def check_security_headers(url: str) -> tuple[int, list[Suggestion]]:
                         add_header X-XSS-Protection "1; mode=block";
                     }}
                     ```"""
-            }
-        }
-        
-        for header, details in headers.items():
-            if header in response.headers:
+    }
+}
+
+def security_header_suggestion(header: str, app_path: str) -> Suggestion:
+    details = SECURITY_HEADERS[header]
+    return Suggestion(
+        title=f"Missing {details['name']} Header",
+        description=details['description'],
+        priority=Priority.HIGH,
+        implementation_factory=lambda: details['example'].format(app_path=app_path)
+    )
+
+def check_security_headers(url: str, pending: Future) -> tuple[int, list[Suggestion]]:
+    app_path = parse_url(url).path.rstrip('/')
+    try:
+        response = pending.result()
+        # Membership is tested on the case-insensitive header mapping; raw key sets keep the server's casing
+        present = {header for header in SECURITY_HEADERS if header in response.headers}
+        for header, details in SECURITY_HEADERS.items():
+            if header in present:
                 print_colored(f"[PASS] {details['name']} header found: {response.headers[header]}", Colors.GREEN)
-                security_score += details['weight']
             else:
                 print_colored(f"[WARN] {details['name']} header not found", Colors.YELLOW)
-                security_suggestions.append(Suggestion(
-                    title=f"Missing {details['name']} Header",
-                    description=details['description'],
-                    priority=Priority.HIGH,
-                    implementation=details['example']
-                ))
-        
+
+        security_score = sum(SECURITY_HEADERS[header]['weight'] for header in present)
+        security_suggestions = [
+            security_header_suggestion(header, app_path) for header in SECURITY_HEADERS if header not in present
+        ]
         return security_score, security_suggestions
     except requests.RequestException as e:
         print_colored(f"[ERROR] Failed to check security headers: {e}", Colors.RED)
@@ -209,52 +637,68 @@ def check_web_capabilities(driver: webdriver.Chrome) -> None:
         'Background Sync': 'navigator.serviceWorker?.sync'
     }
     
-    for cap, api in capabilities.items():
-        is_supported = driver.execute_script(f"return typeof {api} !== 'undefined'")
-        print_colored(f"[INFO] {cap} API: {'Supported' if is_supported else 'Not supported'}", Colors.YELLOW)
+    # Probe every API in one script instead of one WebDriver round-trip per capability
+    script = "return {" + ", ".join(
+        f"{json.dumps(cap)}: typeof {api} !== 'undefined'" for cap, api in capabilities.items()
+    ) + "};"
+    supported = driver.execute_script(script)
+    for cap in capabilities:
+        print_colored(f"[INFO] {cap} API: {'Supported' if supported.get(cap) else 'Not supported'}", Colors.YELLOW)
 
 def validate_icons(icons: List[Dict[str, Any]]) -> List[str]:
     if not icons:
         return ["No icons found in manifest"]
     
-    required_sizes = {
-        "192x192": False,
-        "512x512": False,
-        "maskable": False
-    }
-    
-    issues = []
+    required = ('192x192', '512x512', 'maskable')
+    missing = set(required)
     for icon in icons:
-        if 'sizes' in icon:
-            if '192x192' in icon['sizes']:
-                required_sizes['192x192'] = True
-            if '512x512' in icon['sizes']:
-                required_sizes['512x512'] = True
-        if 'purpose' in icon and 'maskable' in icon['purpose']:
-            required_sizes['maskable'] = True
+        sizes = icon.get('sizes') or ''
+        if '192x192' in sizes:
+            missing.discard('192x192')
+        if '512x512' in sizes:
+            missing.discard('512x512')
+        if 'maskable' in (icon.get('purpose') or ''):
+            missing.discard('maskable')
+        # Stop scanning once every requirement is satisfied
+        if not missing:
+            break
     
-    if not required_sizes['192x192']:
-        issues.append("[WARN] Missing 192x192 icon")
-    if not required_sizes['512x512']:
-        issues.append("[WARN] Missing 512x512 icon")
-    if not required_sizes['maskable']:
-        issues.append("[WARN] Missing maskable icon")
-    
-    return issues
+    return [f"[WARN] Missing {requirement} icon" for requirement in required if requirement in missing]
 
-def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[Suggestion]]:
-    """Check the manifest score and return improvement suggestions."""
-    score = 0
-    suggestions = []
-    target_domain = urlparse(url).netloc
-    app_path = urlparse(url).path.rstrip('/')
-    
-    if not manifest:
-        suggestions.append(Suggestion(
-            title="Add Web App Manifest",
-            description="A web app manifest is required for PWA installation",
-            priority=Priority.CRITICAL,
-            implementation=f"""
+# Upper bound on icon requests in flight for one manifest
+ICON_CHECK_CONCURRENCY = 8
+
+def probe_icon(session: requests.Session, icon_url: str) -> str:
+    """Return a problem description for an icon that cannot be fetched, or an empty string."""
+    try:
+        response = session.head(icon_url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code in [405, 501]:
+            response = get_without_body(session, icon_url, allow_redirects=True)
+    except requests.RequestException as e:
+        return f"[WARN] Icon {icon_url} could not be fetched: {e}"
+    if response.status_code != 200:
+        return f"[WARN] Icon {icon_url} could not be fetched (Status: {response.status_code})"
+    return ''
+
+def verify_icons(icons: List[Dict[str, Any]], manifest_url: str, session: requests.Session) -> List[str]:
+    """Check that the manifest's icons can be fetched, requesting them concurrently."""
+    # Icon paths are relative to the manifest, not the page
+    resolved = (
+        urljoin(manifest_url, icon['src'])
+        for icon in icons if isinstance(icon, dict) and isinstance(icon.get('src'), str) and icon['src']
+    )
+    # data: URIs and other non-HTTP sources have nothing to fetch
+    icon_urls = list(dict.fromkeys(
+        icon_url for icon_url in resolved if parse_url(icon_url).scheme in ('http', 'https')
+    ))
+    if not icon_urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(ICON_CHECK_CONCURRENCY, len(icon_urls))) as executor:
+        results = executor.map(lambda icon_url: probe_icon(session, icon_url), icon_urls)
+        return [issue for issue in results if issue]
+
+# Implementation guides for check_manifest_score, formatted only when a suggestion is printed
+MANIFEST_TEMPLATE = """
                 1. Create manifest.json at https://{target_domain}{app_path}/manifest.json:
                 ```json
                 {{
@@ -319,6 +763,37 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
                    - https://{target_domain}{app_path}/icon-192x192.png
                    - https://{target_domain}{app_path}/icon-512x512.png
                 """
+
+ICONS_TEMPLATE = """Add icons to your manifest.json at https://{target_domain}{app_path}/manifest.json:
+            "icons": [
+                {{
+                    "src": "{app_path}/icon-192x192.png",
+                    "sizes": "192x192",
+                    "type": "image/png",
+                    "purpose": "any maskable"
+                }},
+                {{
+                    "src": "{app_path}/icon-512x512.png",
+                    "sizes": "512x512",
+                    "type": "image/png",
+                    "purpose": "any"
+                }}
+            ]"""
+
+def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[Suggestion]]:
+    """Check the manifest score and return improvement suggestions."""
+    score = 0
+    suggestions = []
+    parsed = parse_url(url)
+    target_domain = parsed.netloc
+    app_path = parsed.path.rstrip('/')
+    
+    if not manifest:
+        suggestions.append(Suggestion(
+            title="Add Web App Manifest",
+            description="A web app manifest is required for PWA installation",
+            priority=Priority.CRITICAL,
+            implementation_factory=lambda: MANIFEST_TEMPLATE.format(target_domain=target_domain, app_path=app_path)
         ))
         return score, suggestions
 
@@ -328,7 +803,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Name",
             description="Name is required for PWA installation",
             priority=Priority.CRITICAL,
-            implementation=f"Add 'name': 'Your App Name' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'name': 'Your App Name' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 20
@@ -338,7 +813,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Start URL",
             description="Start URL is required for PWA installation",
             priority=Priority.CRITICAL,
-            implementation=f"Add 'start_url': '{app_path}/?source=pwa' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'start_url': '{app_path}/?source=pwa' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 20
@@ -349,21 +824,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Icons",
             description="Icons are required for PWA installation",
             priority=Priority.CRITICAL,
-            implementation=f"""Add icons to your manifest.json at https://{target_domain}{app_path}/manifest.json:
-            "icons": [
-                {{
-                    "src": "{app_path}/icon-192x192.png",
-                    "sizes": "192x192",
-                    "type": "image/png",
-                    "purpose": "any maskable"
-                }},
-                {{
-                    "src": "{app_path}/icon-512x512.png",
-                    "sizes": "512x512",
-                    "type": "image/png",
-                    "purpose": "any"
-                }}
-            ]"""
+            implementation_factory=lambda: ICONS_TEMPLATE.format(target_domain=target_domain, app_path=app_path)
         ))
     else:
         icon_score, icon_suggestions = validate_icons(icons)
@@ -376,7 +837,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Short Name",
             description="Short name is used on the user's home screen",
             priority=Priority.HIGH,
-            implementation=f"Add 'short_name': 'App' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'short_name': 'App' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 10
@@ -386,7 +847,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Display Mode",
             description="Display mode defines how the app appears on launch",
             priority=Priority.HIGH,
-            implementation=f"Add 'display': 'standalone' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'display': 'standalone' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 10
@@ -396,7 +857,7 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Background Color",
             description="Background color is shown during app load",
             priority=Priority.HIGH,
-            implementation=f"Add 'background_color': '#FFFFFF' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'background_color': '#FFFFFF' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 10
@@ -406,37 +867,18 @@ def check_manifest_score(manifest: Dict[str, Any], url: str) -> tuple[int, list[
             title="Missing Theme Color",
             description="Theme color defines the app's color scheme",
             priority=Priority.HIGH,
-            implementation=f"Add 'theme_color': '#000000' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
+            implementation_factory=lambda: f"Add 'theme_color': '#000000' to your manifest.json at https://{target_domain}{app_path}/manifest.json"
         ))
     else:
         score += 10
 
     return score, suggestions
 
-def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, list[str], list[Suggestion]]:
-    """Check PWA features and return improvement suggestions."""
-    score = 0
-    max_score = 100
-    results = []
-    suggestions = []
-    app_path = urlparse(url).path.rstrip('/')
-    
-    try:
-        # Check for service worker registration
-        has_sw = driver.execute_script('return navigator.serviceWorker ? true : false;')
-        if has_sw:
-            score += 20
-            results.append("[PASS] Service Worker API available")
-        else:
-            results.append("[FAIL] Service Worker API not available")
-            suggestions.append(Suggestion(
-                title="Add Service Worker Support",
-                description="Service Worker is required for offline functionality",
-                priority=Priority.HIGH,
-                implementation=f"""
-                    1. Create a service worker file at https://{urlparse(url).netloc}{app_path}/service-worker.js:
+# Implementation guides for check_pwa_features, formatted only when a suggestion is printed
+SERVICE_WORKER_TEMPLATE = """
+                    1. Create a service worker file at https://{netloc}{app_path}/service-worker.js:
                     ```javascript
-                    // https://{urlparse(url).netloc}{app_path}/service-worker.js
+                    // https://{netloc}{app_path}/service-worker.js
                     const CACHE_NAME = '{app_path}-v1';
                     const urlsToCache = [
                         '{app_path}/',
@@ -467,7 +909,7 @@ def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, li
 
                     2. Register the service worker in your main JavaScript:
                     ```javascript
-                    // https://{urlparse(url).netloc}{app_path}/app.js
+                    // https://{netloc}{app_path}/app.js
                     if ('serviceWorker' in navigator) {{
                         navigator.serviceWorker.register('{app_path}/service-worker.js', {{
                             scope: '{app_path}/'
@@ -493,20 +935,8 @@ def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, li
                        }}
                        ```
                     """
-            ))
 
-        # Check for HTTPS
-        is_https = driver.execute_script('return window.location.protocol === "https:" ? true : false;')
-        if is_https:
-            score += 20
-            results.append("[PASS] HTTPS detected")
-        else:
-            results.append("[FAIL] HTTPS not detected")
-            suggestions.append(Suggestion(
-                title="Enable HTTPS",
-                description="HTTPS is required for secure communication",
-                priority=Priority.CRITICAL,
-                implementation=f"""
+HTTPS_TEMPLATE = """
                     1. Obtain an SSL certificate (e.g., from Let's Encrypt)
                     2. Install the certificate on your server
                     3. Configure your server to redirect HTTP to HTTPS
@@ -528,20 +958,8 @@ def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, li
                     }}
                     ```
                     """
-            ))
 
-        # Check for responsive design
-        has_viewport = driver.execute_script('return document.querySelector("meta[name=\'viewport\']") ? true : false;')
-        if has_viewport:
-            score += 20
-            results.append("[PASS] Viewport meta tag detected")
-        else:
-            results.append("[FAIL] Viewport meta tag not detected")
-            suggestions.append(Suggestion(
-                title="Add Responsive Design",
-                description="Responsive design is required for a good user experience",
-                priority=Priority.HIGH,
-                implementation=f"""
+RESPONSIVE_TEMPLATE = """
                     1. Add viewport meta tag:
                     <meta name="viewport" content="width=device-width, initial-scale=1">
                     
@@ -560,20 +978,8 @@ def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, li
                     }}
                     ```
                     """
-            ))
 
-        # Check for installability
-        is_installable = driver.execute_script('return window.matchMedia("(display-mode: standalone)").matches || ("standalone" in window.navigator && window.navigator.standalone) ? true : false;')
-        if is_installable:
-            score += 20
-            results.append("[PASS] App is installable")
-        else:
-            results.append("[FAIL] App is not installable")
-            suggestions.append(Suggestion(
-                title="Make App Installable",
-                description="Installability is required for a good user experience",
-                priority=Priority.CRITICAL,
-                implementation=f"""
+INSTALLABLE_TEMPLATE = """
                     Ensure your manifest.json has these required fields:
                     {{
                       "name": "Your App Name",
@@ -594,6 +1000,78 @@ def check_pwa_features(driver: webdriver.Chrome, url: str) -> tuple[int, int, li
                       ]
                     }}
                     """
+
+def check_pwa_features(driver: webdriver.Chrome, url: str, page: PageSnapshot) -> tuple[int, int, list[str], list[Suggestion]]:
+    """Check PWA features and return improvement suggestions."""
+    score = 0
+    max_score = 100
+    results = []
+    suggestions = []
+    parsed = parse_url(url)
+    netloc = parsed.netloc
+    app_path = parsed.path.rstrip('/')
+    
+    try:
+        # Only runtime APIs need the browser; HTTPS and the viewport tag are known from the URL and HTML
+        probes = driver.execute_script("""
+            return {
+                sw: navigator.serviceWorker ? true : false,
+                installable: window.matchMedia("(display-mode: standalone)").matches ||
+                             ("standalone" in window.navigator && window.navigator.standalone) ? true : false
+            };
+        """)
+
+        # Check for service worker registration
+        if probes['sw']:
+            score += 20
+            results.append("[PASS] Service Worker API available")
+        else:
+            results.append("[FAIL] Service Worker API not available")
+            suggestions.append(Suggestion(
+                title="Add Service Worker Support",
+                description="Service Worker is required for offline functionality",
+                priority=Priority.HIGH,
+                implementation_factory=lambda: SERVICE_WORKER_TEMPLATE.format(netloc=netloc, app_path=app_path)
+            ))
+
+        # Check for HTTPS
+        # The snapshot URL is where the page ended up, so an HTTP -> HTTPS redirect still passes
+        if parse_url(page.url).scheme == 'https':
+            score += 20
+            results.append("[PASS] HTTPS detected")
+        else:
+            results.append("[FAIL] HTTPS not detected")
+            suggestions.append(Suggestion(
+                title="Enable HTTPS",
+                description="HTTPS is required for secure communication",
+                priority=Priority.CRITICAL,
+                implementation_factory=lambda: HTTPS_TEMPLATE.format()
+            ))
+
+        # Check for responsive design
+        if page.meta_content('viewport') is not None:
+            score += 20
+            results.append("[PASS] Viewport meta tag detected")
+        else:
+            results.append("[FAIL] Viewport meta tag not detected")
+            suggestions.append(Suggestion(
+                title="Add Responsive Design",
+                description="Responsive design is required for a good user experience",
+                priority=Priority.HIGH,
+                implementation_factory=lambda: RESPONSIVE_TEMPLATE.format()
+            ))
+
+        # Check for installability
+        if probes['installable']:
+            score += 20
+            results.append("[PASS] App is installable")
+        else:
+            results.append("[FAIL] App is not installable")
+            suggestions.append(Suggestion(
+                title="Make App Installable",
+                description="Installability is required for a good user experience",
+                priority=Priority.CRITICAL,
+                implementation_factory=lambda: INSTALLABLE_TEMPLATE.format(app_path=app_path)
             ))
 
     except Exception as e:
@@ -630,23 +1108,20 @@ def check_performance(driver: webdriver.Chrome) -> List[str]:
     
     return results
 
-def generate_manifest_suggestion(driver: webdriver.Chrome, url: str) -> str:
+def generate_manifest_suggestion(page: PageSnapshot, url: str) -> str:
     """Generate a suggested manifest.json based on website metadata"""
     try:
         # Extract metadata from the page
-        metadata = driver.execute_script("""
-            return {
-                title: document.title,
-                description: document.querySelector('meta[name="description"]')?.content,
-                themeColor: document.querySelector('meta[name="theme-color"]')?.content,
-                icon: document.querySelector('link[rel="icon"]')?.href || 
-                      document.querySelector('link[rel="shortcut icon"]')?.href,
-                appleTouchIcon: document.querySelector('link[rel="apple-touch-icon"]')?.href
-            }
-        """)
+        metadata = {
+            'title': page.title,
+            'description': page.meta_content('description'),
+            'themeColor': page.meta_content('theme-color'),
+            'icon': page.link_href('icon') or page.link_href('shortcut icon'),
+            'appleTouchIcon': page.link_href('apple-touch-icon')
+        }
         
         # Parse the URL for default scope
-        parsed_url = urlparse(url)
+        parsed_url = parse_url(url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
         # Generate a basic name from the title or URL
@@ -703,7 +1178,7 @@ def generate_manifest_suggestion(driver: webdriver.Chrome, url: str) -> str:
         ]
         
         # Format the manifest JSON with proper indentation
-        formatted_manifest = json.dumps(manifest, indent=2)
+        formatted_manifest = dumps_json(manifest)
         
         # Create implementation guide
         implementation_guide = f"""
@@ -746,11 +1221,12 @@ Additional Recommendations:
     except Exception as e:
         return f"Error generating manifest suggestion: {str(e)}"
 
-def validate_manifest(manifest_url: str, driver: webdriver.Chrome, url: str) -> Dict[str, Any]:
+def validate_manifest(manifest_url: str, driver: webdriver.Chrome, url: str, session: requests.Session, has_sso: bool) -> Dict[str, Any]:
     """Validate the web app manifest and return its contents."""
-    app_path = urlparse(url).path.rstrip('/')
-    target_domain = urlparse(url).netloc
-    current_domain = urlparse(manifest_url).netloc if manifest_url else None
+    parsed = parse_url(url)
+    app_path = parsed.path.rstrip('/')
+    target_domain = parsed.netloc
+    current_domain = parse_url(manifest_url).netloc if manifest_url else None
 
     if not manifest_url:
         print_colored("[ERROR] No manifest link found in HTML", Colors.RED)
@@ -796,40 +1272,48 @@ Suggestion: Add the manifest link in your HTML files within {app_path}/:
         return None
 
     try:
-        response = requests.get(manifest_url)
-        if response.status_code == 404:
+        status_code, body = fetch_manifest(session, manifest_url)
+        if status_code == 404:
             print_colored(f"\n[INFO] Checking manifest at: https://{target_domain}{app_path}/manifest.json", Colors.BLUE)
             alt_manifest_url = f"https://{target_domain}{app_path}/manifest.json"
-            alt_response = requests.get(alt_manifest_url)
-            if alt_response.status_code == 404:
+            alt_status_code, alt_body = fetch_manifest(session, alt_manifest_url)
+            if alt_status_code == 404:
                 print_colored(f"[ERROR] No manifest found at {alt_manifest_url} (Status: 404)", Colors.RED)
                 return None
-            response = alt_response
+            status_code, body = alt_status_code, alt_body
             manifest_url = alt_manifest_url
 
-        if response.status_code != 200:
-            print_colored(f"[ERROR] Failed to fetch manifest: {response.status_code}", Colors.RED)
+        if status_code != 200:
+            print_colored(f"[ERROR] Failed to fetch manifest: {status_code}", Colors.RED)
             return None
 
         try:
-            manifest = response.json()
-        except json.JSONDecodeError:
+            # orjson rejects a UTF-8 byte order mark, which some servers prepend
+            manifest = loads_json(body[len(codecs.BOM_UTF8):] if body.startswith(codecs.BOM_UTF8) else body)
+        except ValueError:
+            # Covers json.JSONDecodeError, orjson.JSONDecodeError and undecodable bytes
             print_colored("[ERROR] Invalid JSON in manifest", Colors.RED)
             return None
 
         # Validate manifest content
-        manifest_issues = validate_manifest_content(manifest, manifest_url, url, target_domain)
+        manifest_issues = validate_manifest_content(manifest, manifest_url, url, target_domain, has_sso)
         if manifest_issues:
             for issue in manifest_issues:
                 print_colored(f"[WARN] {issue}", Colors.YELLOW)
 
+        if isinstance(manifest, dict) and isinstance(manifest.get('icons'), list):
+            for issue in verify_icons(manifest['icons'], manifest_url, session):
+                print_colored(issue, Colors.YELLOW)
+
         return manifest
 
     except Exception as e:
         print_colored(f"[ERROR] Failed to validate manifest: {str(e)}", Colors.RED)
         return None
 
-def validate_manifest_content(manifest: Dict[str, Any], manifest_url: str, current_url: str, target_domain: str) -> Dict[str, Any]:
+REQUIRED_FIELDS = frozenset({'name', 'short_name', 'start_url', 'display', 'icons'})
+
+def validate_manifest_content(manifest: Dict[str, Any], manifest_url: str, current_url: str, target_domain: str, has_sso: bool) -> Dict[str, Any]:
     """Validate manifest content and provide specific feedback."""
     if not isinstance(manifest, dict):
         print_colored("[ERROR] Manifest must be a JSON object", Colors.RED)
@@ -837,45 +1321,25 @@ def validate_manifest_content(manifest: Dict[str, Any], manifest_url: str, curre
         
     # Validate start_url
     if 'start_url' in manifest:
-        manifest_domain = urlparse(manifest_url).netloc
+        manifest_domain = parse_url(manifest_url).netloc
         
         # Only validate start_url if we're on the target PWA domain
         if manifest_domain == target_domain:
-            current_path = urlparse(current_url).path
+            current_path = parse_url(current_url).path
             start_url = manifest['start_url']
             
-            # Check if SSO is used before showing SSO-related warnings
-            try:
-                response = requests.get(current_url, allow_redirects=False)
-                has_sso = False
-                max_redirects = 10
-                redirect_count = 0
-                
-                while response.status_code in [301, 302, 303, 307, 308] and redirect_count < max_redirects:
-                    location = response.headers.get('Location', '')
-                    if "saml" in location.lower() or "oauth" in location.lower() or "oidc" in location.lower():
-                        has_sso = True
-                        break
-                    try:
-                        response = requests.get(location, allow_redirects=False)
-                        redirect_count += 1
-                    except requests.exceptions.RequestException:
-                        break
-                
-                if has_sso and (start_url == '/' or not start_url.startswith(current_path)):
-                    print_colored(f"[WARN] start_url '{start_url}' may cause redirect issues after SSO login", Colors.YELLOW)
-                    print_colored(f"       Consider using '{current_path}' as the start_url", Colors.YELLOW)
-                    manifest['start_url'] = current_path
-            except requests.exceptions.RequestException:
-                # If we can't check SSO, skip the warning
-                pass
+            # Only show SSO-related warnings when the redirect chain went through an SSO provider
+            if has_sso and (start_url == '/' or not start_url.startswith(current_path)):
+                print_colored(f"[WARN] start_url '{start_url}' may cause redirect issues after SSO login", Colors.YELLOW)
+                print_colored(f"       Consider using '{current_path}' as the start_url", Colors.YELLOW)
+                manifest['start_url'] = current_path
     
     # Validate required fields
-    required_fields = ['name', 'short_name', 'start_url', 'display', 'icons']
-    for field in required_fields:
-        if field not in manifest:
+    missing = REQUIRED_FIELDS - manifest.keys()
+    if missing:
+        for field in sorted(missing):
             print_colored(f"[ERROR] Required field '{field}' missing from manifest", Colors.RED)
-            return None
+        return None
             
     # Validate icons
     if not validate_icons(manifest.get('icons', [])):
@@ -884,40 +1348,35 @@ def validate_manifest_content(manifest: Dict[str, Any], manifest_url: str, curre
     
     return manifest
 
-def check_sso_redirect(url: str) -> list[Suggestion]:
-    """Check if the site uses SSO and provide relevant suggestions."""
-    target_domain = urlparse(url).netloc
-    app_path = urlparse(url).path.rstrip('/')  # Get the app path from the URL
-    print_colored("[INFO] SSO Redirect Chain:", Colors.BLUE)
-    suggestions = []
-    try:
-        response = requests.get(url, allow_redirects=False)
-        redirect_chain = []
-        max_redirects = 10
-        redirect_count = 0
-        
-        while response.status_code in [301, 302, 303, 307, 308] and redirect_count < max_redirects:
-            location = response.headers.get('Location', '')
-            redirect_type = "SSO" if "saml" in location.lower() or "oauth" in location.lower() or "oidc" in location.lower() else "HTTP"
-            redirect_chain.append(f"{response.status_code} → {redirect_type}: {location}")
-            print_colored(f"{redirect_count + 1}. {response.status_code} → {redirect_type}: {location}", Colors.BLUE)
-            
-            try:
-                response = requests.get(location, allow_redirects=False)
-                redirect_count += 1
-            except requests.exceptions.RequestException:
-                break
-                
-        if redirect_chain:
-            print_colored(f"\n[INFO] Site uses SSO authentication", Colors.BLUE)
-            
-            # Add SSO-specific suggestions for the PWA
-            suggestions.extend([
-                Suggestion(
-                    title="Configure PWA for SSO Support",
-                    description=f"Update {target_domain}'s PWA configuration to handle SSO authentication",
-                    priority=Priority.HIGH,
-                    implementation=f"""
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+def request_hop(session: requests.Session, url: str) -> requests.Response:
+    """Request a single URL without following redirects or downloading the body."""
+    response = session.head(url, allow_redirects=False, timeout=REQUEST_TIMEOUT)
+    if response.status_code in [405, 501]:
+        response = get_without_body(session, url, allow_redirects=False)
+    return response
+
+def walk_redirect_chain(url: str, session: requests.Session) -> list[tuple[int, str]]:
+    """Follow redirects from url and return the status code and Location of each hop."""
+    max_redirects = 10
+    hops = []
+    # Only the status codes and Location headers are needed, so skip the bodies
+    response = request_hop(session, url)
+    while response.status_code in REDIRECT_STATUSES:
+        location = response.headers.get('Location', '')
+        hops.append((response.status_code, location))
+        if not location or len(hops) >= max_redirects:
+            break
+        try:
+            response = request_hop(session, urljoin(response.url, location))
+        except requests.RequestException:
+            # Keep the hops seen so far; identity providers are often unreachable from outside a VPN
+            break
+    return hops
+
+# Implementation guide for check_sso_redirect, formatted only when the suggestion is printed
+SSO_TEMPLATE = """
                 1. Update manifest.json on {target_domain}:
                    ```json
                    {{
@@ -1001,12 +1460,38 @@ def check_sso_redirect(url: str) -> list[Suggestion]:
                    // Store SSO token after authentication
                    async function handleAuthSuccess(token) {{
                      // Use app-specific cache name
-                     const cache = await caches.open('auth-{app_path.replace("/", "-")}');
+                     const cache = await caches.open('auth-{auth_cache_suffix}');
                      // Store token with app-scoped URL
                      await cache.put('{app_path}/api/auth', new Response(token));
                    }}
                    ```
                 """
+
+def check_sso_redirect(target_domain: str, app_path: str, pending: Future) -> tuple[list[Suggestion], bool]:
+    """Check if the site uses SSO and return relevant suggestions and whether an SSO hop was seen."""
+    print_colored("[INFO] SSO Redirect Chain:", Colors.BLUE)
+    suggestions = []
+    has_sso = False
+    try:
+        redirect_chain = []
+        for redirect_count, (status_code, location) in enumerate(pending.result()):
+            redirect_type = "SSO" if SSO_RE.search(location) else "HTTP"
+            has_sso = has_sso or redirect_type == "SSO"
+            redirect_chain.append(f"{status_code} → {redirect_type}: {location}")
+            print_colored(f"{redirect_count + 1}. {status_code} → {redirect_type}: {location}", Colors.BLUE)
+                
+        if redirect_chain:
+            print_colored(f"\n[INFO] Site uses SSO authentication", Colors.BLUE)
+            
+            # Add SSO-specific suggestions for the PWA
+            suggestions.extend([
+                Suggestion(
+                    title="Configure PWA for SSO Support",
+                    description=f"Update {target_domain}'s PWA configuration to handle SSO authentication",
+                    priority=Priority.HIGH,
+                    implementation_factory=lambda: SSO_TEMPLATE.format(
+                        target_domain=target_domain, app_path=app_path, auth_cache_suffix=app_path.replace("/", "-")
+                    )
                 )
             ])
         else:
@@ -1015,63 +1500,82 @@ def check_sso_redirect(url: str) -> list[Suggestion]:
     except requests.exceptions.RequestException as e:
         print_colored(f"[ERROR] Failed to check SSO redirects: {str(e)}", Colors.RED)
         
-    return suggestions
+    return suggestions, has_sso
+
+# Seconds to wait for a JavaScript-injected manifest link to appear
+MANIFEST_WAIT_TIMEOUT = 5
+
+# Matches the same links as PageSnapshot.manifest_href
+MANIFEST_LINK_SELECTOR = 'link[rel="manifest"], link[href*="manifest"]'
+
+def find_rendered_manifest(driver: webdriver.Chrome) -> Optional[str]:
+    """Wait for a manifest link to appear in the browser-rendered page."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # Returns as soon as the link exists instead of sleeping a fixed time
+    try:
+        WebDriverWait(driver, MANIFEST_WAIT_TIMEOUT, poll_frequency=0.1).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, MANIFEST_LINK_SELECTOR))
+        )
+    except TimeoutException:
+        return None
+    # Parse the rendered DOM once so rel="manifest" wins over other matching links
+    return parse_page(driver.page_source, driver.current_url).manifest_href()
 
 def check_pwa(url: str) -> None:
     total_steps = 7
     current_step = 0
     manifest_score = 0
     all_suggestions: list[Suggestion] = []
+    _cache_hits.clear()
 
-    print_colored("\n" + "="*50, Colors.HEADER)
+    print_colored("\n" + HR, Colors.HEADER)
     print_colored(f"PWA Validation Report for {url}", Colors.HEADER, bold=True)
-    print_colored("="*50 + "\n", Colors.HEADER)
+    print_colored(HR + "\n", Colors.HEADER)
 
-    # First check for SSO
-    print_progress("Checking SSO configuration", total_steps, current_step)
-    sso_suggestions = check_sso_redirect(url)
-    all_suggestions.extend(sso_suggestions)
-    
-    current_step += 1
+    parsed = parse_url(url)
+    target_domain = parsed.netloc
+    app_path = parsed.path.rstrip('/')  # Get the app path from the URL
+    session = http_session
+    # Put every independent HTTP fetch in flight before the browser starts; each step below waits only for its own result.
+    # A single non-following HEAD carries both the redirect Location and the security headers.
+    redirect_hops = http_executor.submit(walk_redirect_chain, url, session)
+    headers_response = http_executor.submit(cached_request, session, 'HEAD', url, allow_redirects=False, timeout=REQUEST_TIMEOUT)
+    robots_response = http_executor.submit(fetch_robots_txt, session, url)
+    served_page = http_executor.submit(fetch_page, session, url)
+    manifest_prefetch = http_executor.submit(prefetch_manifest, session, served_page)
+
+    with driver_pool.acquire() as driver:
+        # Navigate in the background; nothing below needs the browser until the feature checks
+        page_load = http_executor.submit(driver.get, url)
+
+        # First check for SSO
+        print_progress("Checking SSO configuration", total_steps, current_step)
+        sso_suggestions, has_sso = check_sso_redirect(target_domain, app_path, redirect_hops)
+        all_suggestions.extend(sso_suggestions)
+        
+        current_step += 1
 
-    # Setup Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    driver = webdriver.Chrome(options=chrome_options)
-    
-    try:
         print_progress("Checking manifest", total_steps, current_step)
         
-        # Try to access the URL with Selenium first
         try:
-            driver.get(url)
-            # Wait for any client-side redirects and dynamic content
-            time.sleep(3)  # Increased wait time for dynamic content
-            
-            # Try multiple ways to find the manifest
-            manifest_url = driver.execute_script("""
-                // Try standard link tag
-                let manifest = document.querySelector('link[rel="manifest"]')?.href;
-                if (!manifest) {
-                    // Try React Helmet and other dynamic implementations
-                    const reactHelmetTags = document.querySelectorAll('link[rel="manifest"]');
-                    for (const tag of reactHelmetTags) {
-                        if (tag.getAttribute('data-react-helmet') === 'true' || tag.href.includes('manifest')) {
-                            manifest = tag.href;
-                            break;
-                        }
-                    }
-                }
-                if (!manifest) {
-                    // Try finding any link with manifest in the href as a fallback
-                    manifest = document.querySelector('link[href*="manifest"]')?.href;
-                }
-                return manifest;
-            """)
+            # Most sites link the manifest in the served HTML, which is already parsed and its manifest fetched
+            try:
+                manifest_url = manifest_prefetch.result()
+            except requests.RequestException:
+                manifest_url = None
+
+            if not manifest_url:
+                # The link may be injected by JavaScript, so look for it in the rendered page
+                page_load.result()
+                manifest_url = find_rendered_manifest(driver)
             
             if manifest_url:
                 print_colored(f"\n[INFO] Found manifest at: {manifest_url}", Colors.BLUE)
-                manifest = validate_manifest(manifest_url, driver, url)
+                manifest = validate_manifest(manifest_url, driver, url, session, has_sso)
                 if manifest:
                     manifest_score, manifest_suggestions = check_manifest_score(manifest, url)
                     all_suggestions.extend(manifest_suggestions)
@@ -1090,14 +1594,18 @@ def check_pwa(url: str) -> None:
         
         # Continue with other checks...
         print_progress("Checking PWA features", total_steps, current_step)
-        features_score, features_max, feature_results, feature_suggestions = check_pwa_features(driver, url)
+        wait([page_load])
+        page = load_page(served_page, driver)
+        features_score, features_max, feature_results, feature_suggestions = check_pwa_features(driver, url, page)
         for result in feature_results:
             print_colored(result, Colors.GREEN if "[PASS]" in result else Colors.RED)
         all_suggestions.extend(feature_suggestions)
         
         current_step += 1
         print_progress("Checking security", total_steps, current_step)
-        security_score, security_suggestions = check_security_headers(url)
+        check_redirects(url, headers_response)
+        check_robots_txt(url, robots_response)
+        security_score, security_suggestions = check_security_headers(url, headers_response)
         all_suggestions.extend(security_suggestions)
         
         current_step += 1
@@ -1106,7 +1614,7 @@ def check_pwa(url: str) -> None:
         
         current_step += 1
         print_progress("Checking SEO & Accessibility", total_steps, current_step)
-        check_meta_tags(driver)
+        check_meta_tags(page)
         
         # Print all suggestions grouped by priority
         if all_suggestions:
@@ -1123,17 +1631,33 @@ def check_pwa(url: str) -> None:
                         print_colored("\n   Implementation:", Colors.GREEN)
                         print(f"   {suggestion.implementation}")
                         print()
+
+        if _cache_hits:
+            print_colored(f"\n[INFO] {len(_cache_hits)} response(s) were served from the local cache (--cache):", Colors.BLUE)
+            for cached_url, expired in _cache_hits.items():
+                if expired:
+                    print_colored(f"       {cached_url} (stale; the site returned an error)", Colors.YELLOW)
+                else:
+                    print_colored(f"       {cached_url}", Colors.BLUE)
         
-        print_colored("\n" + "="*50, Colors.HEADER)
+        print_colored("\n" + HR, Colors.HEADER)
         print_colored("Final PWA Score: {}/300".format(
             features_score + security_score + manifest_score
         ), Colors.HEADER, bold=True)
-        print_colored("="*50 + "\n", Colors.HEADER)
-        
-    finally:
-        driver.quit()
+        print_colored(HR + "\n", Colors.HEADER)
 
 if __name__ == "__main__":
-    import sys
-    target_url = sys.argv[1] if len(sys.argv) > 1 else 'https://example.com'
-    check_pwa(target_url)
+    parser = argparse.ArgumentParser(description="Check web applications against PWA best practices.")
+    parser.add_argument('urls', nargs='*', default=['https://example.com'], help="URLs to validate")
+    parser.add_argument(
+        '--cache', action='store_true',
+        help=f"reuse responses from previous runs for up to {PERSISTENT_CACHE_TTL} seconds (requires requests-cache)"
+    )
+    args = parser.parse_args()
+    if args.cache:
+        if CachedSession is None:
+            parser.error("--cache requires the requests-cache package")
+        http_session = create_session(use_cache=True)
+        atexit.register(http_session.close)
+    for target_url in args.urls:
+        check_pwa(target_url)